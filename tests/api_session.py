@@ -0,0 +1,23 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def api_session():
+    """
+    Returns a session shared by the API test scripts so repeated calls reuse keep-alive connections.
+    Transient failures are retried on the pooled connection.
+    Per-API headers belong on the individual requests, not on this shared session.
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+# trading_bot.py is a top-level script rather than an installed package, so make it importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trading_bot  # noqa: E402
+from trading_bot import PumpFunBot  # noqa: E402
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """
+    A bot with dummy credentials that works in a temporary directory and never touches the network.
+    """
+    monkeypatch.chdir(tmp_path)
+    for name in ("PUMPFUN_API_KEY", "WALLET_PUBLIC_KEY", "WALLET_PRIVATE_KEY"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setattr(PumpFunBot, "warm_connections", lambda self: None)
+    trading_bot.get_config.cache_clear()
+    bot = PumpFunBot()
+    yield bot
+    bot._executor.shutdown(wait=True)
+    bot._new_token_executor.shutdown(wait=True)
+    bot._order_executor.shutdown(wait=True)
+    trading_bot.get_config.cache_clear()
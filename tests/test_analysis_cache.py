@@ -0,0 +1,98 @@
+import os
+import time
+
+import orjson
+import pytest
+
+from trading_bot import TokenAnalysis
+
+
+def test_remember_analysis_evicts_least_recently_used(bot):
+    bot.analysis_cache_size = 3
+    now = time.monotonic()
+    for token in ("a", "b", "c"):
+        bot.remember_analysis(token, TokenAnalysis(now, True))
+
+    assert not bot.should_analyze_token("a")  # A cache hit makes "a" the most recently used
+    bot.remember_analysis("d", TokenAnalysis(now, True))
+
+    assert list(bot.analyzed_tokens) == ["c", "a", "d"]
+
+
+def test_remember_analysis_evicts_expired_entries(bot):
+    now = time.monotonic()
+    bot.remember_analysis("old", TokenAnalysis(now - bot.analysis_cache_time - 1, True))
+    bot.remember_analysis("new", TokenAnalysis(now, False))
+
+    assert list(bot.analyzed_tokens) == ["new"]
+    assert bot.should_analyze_token("old")
+    assert not bot.should_analyze_token("new")
+
+
+def test_cache_survives_save_and_load(bot):
+    now = time.monotonic()
+    bot.remember_analysis("safe", TokenAnalysis(now - 10, True))
+    bot.remember_analysis("unsafe", TokenAnalysis(now, False))
+    saved = dict(bot.analyzed_tokens)
+
+    bot.save_cache_to_file()
+    assert not bot._cache_dirty
+    bot.analyzed_tokens.clear()
+    bot.load_cache_from_file()
+
+    assert list(bot.analyzed_tokens) == ["safe", "unsafe"]
+    for token, analysis in saved.items():
+        assert bot.analyzed_tokens[token].is_safe is analysis.is_safe
+        assert bot.analyzed_tokens[token].timestamp == pytest.approx(analysis.timestamp, abs=0.1)
+
+
+def test_analysis_recorded_during_a_save_marks_the_cache_dirty(bot, monkeypatch):
+    bot.remember_analysis("first", TokenAnalysis(time.monotonic(), True))
+    replace = os.replace
+
+    def replace_after_new_analysis(src, dst):
+        bot.remember_analysis("second", TokenAnalysis(time.monotonic(), False))
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace_after_new_analysis)
+    bot.save_cache_to_file()
+
+    assert bot._cache_dirty
+
+
+def test_failed_save_keeps_the_cache_dirty(bot, monkeypatch):
+    bot.remember_analysis("tok", TokenAnalysis(time.monotonic(), True))
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    bot.save_cache_to_file()
+
+    assert bot._cache_dirty
+
+
+def test_load_cache_skips_stale_and_malformed_entries(bot):
+    now = time.time()
+    cache = {
+        "fresh": {"timestamp": now - 10, "is_safe": True},
+        "stale": {"timestamp": now - bot.analysis_cache_time - 10, "is_safe": True},
+        "future": {"timestamp": now + 3600, "is_safe": True},
+        "bad_timestamp": {"timestamp": "soon", "is_safe": True},
+        "not_an_object": 1,
+    }
+    with open("analyzed_tokens_cache.json", "wb") as f:
+        f.write(orjson.dumps(cache))
+
+    bot.load_cache_from_file()
+
+    assert list(bot.analyzed_tokens) == ["fresh"]
+
+
+def test_load_cache_ignores_a_file_of_the_wrong_shape(bot):
+    with open("analyzed_tokens_cache.json", "wb") as f:
+        f.write(b"[]")
+
+    bot.load_cache_from_file()
+
+    assert not bot.analyzed_tokens
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+import trading_bot
+
+
+def test_concurrent_examinations_share_one_fetch(bot, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_examine(token_address):
+        calls.append(token_address)
+        started.set()
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(bot, "_examine_token_contract", fake_examine)
+    results = []
+
+    def examine():
+        results.append(bot.examine_token_contract("tok"))
+
+    threads = [threading.Thread(target=examine) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # Later callers either wait on the in-flight fetch or find its result already cached
+    assert calls == ["tok"]
+    assert results == [True, True, True]
+    assert bot.analyzed_tokens["tok"].is_safe is True
+    assert not bot._inflight_examinations
+
+
+def test_failed_examination_is_not_cached(bot, monkeypatch):
+    def failing_examine(token_address):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bot, "_examine_token_contract", failing_examine)
+
+    with pytest.raises(RuntimeError):
+        bot.examine_token_contract("tok")
+    assert "tok" not in bot.analyzed_tokens
+    assert not bot._inflight_examinations
+    assert bot.examine_token_contracts(["tok"]) == {"tok": False}
+
+
+def test_new_token_examinations_are_bounded_and_deduplicated(bot, monkeypatch):
+    monkeypatch.setattr(trading_bot, "NEW_TOKEN_BACKLOG", 2)
+    release = threading.Event()
+    calls = []
+
+    def blocked_examine(token_address):
+        calls.append(token_address)
+        release.wait(5)
+        return False
+
+    monkeypatch.setattr(bot, "_examine_token_contract", blocked_examine)
+
+    for mint in ("a", "a", "b", "c"):
+        bot.handle_new_token({"mint": mint, "symbol": mint.upper()})
+
+    # "c" arrived with the backlog full and is left to the main loop
+    assert bot._queued_new_tokens == {"a", "b"}
+    release.set()
+    bot._new_token_executor.shutdown(wait=True)
+
+    assert sorted(calls) == ["a", "b"]
+    assert not bot._queued_new_tokens
+
+
+def test_only_backlogged_new_tokens_wake_the_main_loop(bot, monkeypatch):
+    monkeypatch.setattr(trading_bot, "NEW_TOKEN_BACKLOG", 1)
+    release = threading.Event()
+    monkeypatch.setattr(bot, "_examine_token_contract", lambda token_address: release.wait(5))
+
+    bot.handle_new_token({"mint": "a", "symbol": "A"})
+    assert not bot._wake.is_set()  # The new-token pool has it
+
+    bot.handle_new_token({"mint": "b", "symbol": "B"})
+    assert bot._wake.is_set()
+    release.set()
@@ -1,12 +1,14 @@
 import requests
 import logging
+import orjson
+from api_session import api_session
 from dotenv import load_dotenv
 import os
 
 # Load environment variables from .env file
 load_dotenv('secrets.env')
 
-def test_pumpfun_api():
+def check_pumpfun_api():
     """
     Test the PumpFun API with the API key from environment variables.
     """
@@ -15,23 +17,23 @@ def test_pumpfun_api():
         if not api_key:
             raise ValueError("API key not found in environment variables.")
         
-        headers = {
+        # Headers go on the request so the API key never leaks onto the shared session
+        response = api_session().get("https://pumpportal.fun/api/test_endpoint", headers={
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
-        }
-        response = requests.get("https://pumpportal.fun/api/test_endpoint", headers=headers)
+        })
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print("PumpFun API Test Successful:", data)
         else:
             print(f"PumpFun API Test Failed: Status Code {response.status_code}")
             print("Response Content:", response.text)
-    except requests.RequestException as e:
-        logging.error(f"Failed to test PumpFun API: {e}")
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        logging.error("Failed to test PumpFun API: %s", e)
     except ValueError as e:
         logging.error(e)
 
 # Example usage
 if __name__ == "__main__":
-    test_pumpfun_api() 
\ No newline at end of file
+    check_pumpfun_api() 
\ No newline at end of file
@@ -0,0 +1,99 @@
+import logging
+import threading
+
+import pytest
+
+
+def expected_holdings_value(bot):
+    return sum(amount * bot.token_prices.get(token, 0) for token, amount in bot.positions.items())
+
+
+def test_simulate_trade_buys_and_sells(bot):
+    bot.simulate_trade("A", "buy", 0.5, 1.0)
+    assert bot.virtual_balance == 0.5
+    assert bot.positions == {"A": 0.5}
+    assert bot.token_prices == {"A": 1.0}
+
+    bot.simulate_trade("A", "sell", 0.25, 2.0)
+    assert bot.virtual_balance == 1.0
+    assert bot.positions == {"A": 0.25}
+    assert bot.token_prices == {"A": 1.0}  # A sell keeps the purchase price
+
+    bot.simulate_trade("A", "sell", 0.25, 2.0)
+    assert bot.virtual_balance == 1.5
+    assert bot.positions == {}
+    assert bot.token_prices == {}
+    assert bot._holdings_value == 0
+
+
+@pytest.mark.parametrize("coin, side, quantity, price", [
+    ("A", "buy", 2.0, 1.0),    # Costs more than the balance
+    ("A", "sell", 0.75, 1.0),  # Sells more than is held
+    ("B", "sell", 0.25, 1.0),  # Sells a token that isn't held
+    ("A", "hold", 0.25, 1.0),  # Unknown side
+])
+def test_simulate_trade_rejects_without_changing_state(bot, coin, side, quantity, price):
+    bot.simulate_trade("A", "buy", 0.5, 1.0)
+    before = (bot.virtual_balance, dict(bot.positions), dict(bot.token_prices), bot._holdings_value)
+
+    bot.simulate_trade(coin, side, quantity, price)
+
+    assert (bot.virtual_balance, bot.positions, bot.token_prices, bot._holdings_value) == before
+
+
+def test_simulate_trade_keeps_holdings_value_in_step(bot):
+    trades = [
+        ("A", "buy", 0.01, 10), ("B", "buy", 0.05, 3), ("A", "buy", 0.02, 20),
+        ("B", "sell", 0.02, 4), ("A", "sell", 0.01, 30), ("C", "buy", 0.1, 0.5),
+        ("B", "sell", 0.03, 4), ("A", "sell", 0.02, 25), ("C", "sell", 0.1, 1),
+    ]
+    for trade in trades:
+        bot.simulate_trade(*trade)
+        assert bot._holdings_value == pytest.approx(expected_holdings_value(bot))
+        assert bot.virtual_balance >= 0
+        assert all(amount > 0 for amount in bot.positions.values())
+
+
+def test_print_stats_reads_a_consistent_portfolio(bot, capsys):
+    stop = threading.Event()
+
+    def trade():
+        while not stop.is_set():
+            for i in range(50):
+                bot.simulate_trade("T%d" % i, "buy", 0.001, 1.0)
+            for i in range(50):
+                bot.simulate_trade("T%d" % i, "sell", 0.001, 1.0)
+
+    trader = threading.Thread(target=trade)
+    trader.start()
+    try:
+        for _ in range(200):
+            bot.print_stats()  # Raises if the positions dict changes size mid-iteration
+    finally:
+        stop.set()
+        trader.join(5)
+    capsys.readouterr()
+
+
+def test_failed_order_is_logged(bot, monkeypatch, caplog):
+    def failing_trade(coin, side, quantity, price):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bot, "simulate_trade", failing_trade)
+
+    with caplog.at_level(logging.ERROR):
+        future = bot.place_order("A", "buy", 0.1, 1.0)
+        with pytest.raises(RuntimeError):
+            future.result(5)
+        bot._order_executor.shutdown(wait=True)  # Done callbacks have run once the worker exits
+
+    assert "Order failed" in caplog.text
+
+
+
+def test_simulate_trade_warns_about_an_invalid_side(bot, caplog):
+    with caplog.at_level(logging.WARNING):
+        bot.simulate_trade("A", "hold", 0.25, 1.0)
+
+    assert "Invalid side" in caplog.text
+    assert bot.virtual_balance == 1
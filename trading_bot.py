@@ -1,22 +1,95 @@
+import atexit
 import os
+import queue
+import signal
+import socket
+import sys
 import time
+import threading
 import logging
+import logging.handlers
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-import json
+import orjson
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import quote, urlencode, urlsplit
+
+log = logging.getLogger(__name__)
 
 # Load environment variables from secrets.env file
 load_dotenv('secrets.env')
 
-# Configuration for the PumpFun API
-API_KEY = os.getenv("PUMPFUN_API_KEY")
-WALLET_PUBLIC_KEY = os.getenv("WALLET_PUBLIC_KEY")
-WALLET_PRIVATE_KEY = os.getenv("WALLET_PRIVATE_KEY")
-
 # Base URL for the PumpFun API
 BASE_URL = "https://pumpportal.fun/api"
 
+# PumpPortal WebSocket feed for real-time market data
+WS_URL = "wss://pumpportal.fun/api/data"
+
+# GMGN swap route endpoint used to examine token contracts
+GMGN_SWAP_ROUTE_URL = "https://gmgn.ai/defi/router/v1/sol/tx/get_swap_route"
+GMGN_SWAP_ROUTE_PARAMS = {
+    "token_out_address": "So11111111111111111111111111111111111111112",
+    "in_amount": 100000000,
+    "slippage": 5.0
+}
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Configuration for the PumpFun API and wallet.
+    """
+    api_key: str
+    wallet_public_key: str
+    wallet_private_key: str
+    base_url: str = BASE_URL
+    ws_url: str = WS_URL
+    swap_route_url: str = GMGN_SWAP_ROUTE_URL
+
+@lru_cache(maxsize=1)
+def get_config():
+    """
+    Reads the configuration from environment variables once and caches it.
+    Call get_config.cache_clear() to pick up changed environment variables.
+    """
+    return Config(
+        api_key=os.getenv("PUMPFUN_API_KEY"),
+        wallet_public_key=os.getenv("WALLET_PUBLIC_KEY"),
+        wallet_private_key=os.getenv("WALLET_PRIVATE_KEY")
+    )
+
+class TokenAnalysis(NamedTuple):
+    """
+    Cached result of a token contract examination.
+    A tuple rather than a dict keeps each of the many cache entries small.
+    """
+    timestamp: float  # time.monotonic() when the token was analyzed
+    is_safe: bool
+
+# Maximum number of in-flight requests per host (the examination pools together are sized to this)
+MAX_REQUESTS_PER_HOST = 16
+
+# Workers reserved for examining tokens as their creation events arrive; the main loop's pool gets the rest
+NEW_TOKEN_WORKERS = 4
+
+# Most new-token examinations queued at once; tokens arriving beyond this are left to the main loop
+NEW_TOKEN_BACKLOG = 256
+
+# Longest Retry-After back-off honored, in seconds; longer requests are capped
+MAX_RETRY_AFTER = 60
+
+# (connect, read) timeouts in seconds for HTTP requests
+HTTP_TIMEOUT = (2, 5)
+
+# Dispatcher batch size above which the backlog is reported as falling behind
+RX_BACKLOG_WARN = 10000
+
 # ANSI escape codes for colored logging
 class LogColors:
     HEADER = '\033[95m'
@@ -29,9 +102,92 @@ class LogColors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Keys that mark WebSocket control messages rather than market events
+_CONTROL_KEYS = frozenset(('message', 'errors', 'result'))
+
+def _frame_text(message):
+    """
+    Returns a WebSocket frame as text for logging.
+    Frames arrive as bytes because UTF-8 validation (and decoding) is skipped.
+    """
+    return message.decode('utf-8', 'replace') if isinstance(message, bytes) else message
+
+# Streams subscribed to on every (re)connect, serialized once at import
+_SUBSCRIPTIONS = (
+    {"method": "subscribeNewToken"},
+    {"method": "subscribeTokenTrade", "params": ["ALL"]},  # or specific tokens
+    {"method": "subscribeRaydiumLiquidity"}
+)
+_SUBSCRIPTION_FRAMES = tuple(orjson.dumps(sub) for sub in _SUBSCRIPTIONS)
+_SUBSCRIPTION_METHODS = ", ".join(sub['method'] for sub in _SUBSCRIPTIONS)
+
+# Precomputed log templates for simulated trades
+_BUY_TMPL = (
+    LogColors.OKCYAN + "\n=== SIMULATED BUY ===\n"
+    "Token: %s\n"
+    "Quantity: %.4f\n"
+    "Price: ◎%.4f\n"
+    "Cost: ◎%.4f\n"
+    "New Balance: ◎%.4f\n"
+    "Positions: %s\n"
+    "Token Prices: %s" + LogColors.ENDC
+)
+_SELL_TMPL = (
+    LogColors.OKCYAN + "\n=== SIMULATED SELL ===\n"
+    "Token: %s\n"
+    "Quantity: %.4f\n"
+    "Price: ◎%.4f\n"
+    "Proceeds: ◎%.4f\n"
+    "New Balance: ◎%.4f\n"
+    "Positions: %s\n"
+    "Token Prices: %s" + LogColors.ENDC
+)
+
+# Precomputed layout for the stats banner
+_STATS_TMPL = (
+    "\n" + LogColors.HEADER +
+    "╔══════════════════════════════════════════════════════════════════╗\n"
+    "║                     PumpFun Trading Bot Stats                     ║\n"
+    "╠═══════════════════════════════╦══════════════════════════════════╣\n"
+    "║ ACCOUNT SUMMARY               ║ TRADING ACTIVITY                  ║\n"
+    "╟───────────────────────────────╫──────────────────────────────────╢\n"
+    "║ Virtual Balance: ◎%-10.4f ║ Paper Mode: %-19s ║\n"
+    "║ Holdings Value:  ◎%-10.4f ║ Active Tokens: %-16s ║\n"
+    "║ Total Value:     ◎%-10.4f ║ Last Update: %s  ║\n"
+    "╠═══════════════════════════════╩══════════════════════════════════╣\n"
+    "║ CURRENT HOLDINGS                                                 ║\n"
+    "╟──────────────────────────────────────────────────────────────────╢" + LogColors.ENDC +
+    "%s"
+    "\n" + LogColors.HEADER +
+    "╚══════════════════════════════════════════════════════════════════╝" + LogColors.ENDC + "\n"
+)
+_HOLDING_ROW_TMPL = "\n" + LogColors.OKBLUE + "║ %-12.12s │ Amount: %-10.4f │ Market Cap: ◎%-8.4f │ ◎%-10.4f ║" + LogColors.ENDC
+_NO_HOLDINGS_ROW = "\n" + LogColors.WARNING + "║ No active positions                                              ║" + LogColors.ENDC
+
+class LowLatencyAdapter(HTTPAdapter):
+    """
+    HTTP adapter that disables Nagle's algorithm and enables TCP keep-alive on pooled sockets.
+    """
+    socket_options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+# Socket options for the market-data WebSocket. websocket-client already turns on
+# TCP_NODELAY and keep-alive; stated here so the feed never depends on that default.
+_WS_SOCKOPT = (
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+)
+
 class PumpFunBot:
     def __init__(self, paper_mode=True, buy_amount=0.1):
-        if not API_KEY or not WALLET_PUBLIC_KEY or not WALLET_PRIVATE_KEY:
+        self._cfg = get_config()
+        if not self._cfg.api_key or not self._cfg.wallet_public_key or not self._cfg.wallet_private_key:
             raise ValueError("API keys or wallet keys not set. Please set them in the .env file.")
         
         # Validate buy_amount
@@ -42,20 +198,64 @@ class PumpFunBot:
         self.session.headers.update({
             "Content-Type": "application/json"
         })
-        self.base_url = BASE_URL
+        # Retry transient failures with exponential backoff instead of losing a whole cycle
+        retry = Retry(
+            total=5,
+            backoff_factor=0.3,
+            backoff_jitter=0.1,  # Spreads out retries from workers that failed together
+            status_forcelist=[500, 502, 503, 504],
+            # 429s and Retry-After are handled per host in _request, interruptibly and capped
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = LowLatencyAdapter(pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.base_url = self._cfg.base_url
+        # The swap route query only varies by token, so encode the rest once
+        self._swap_route_query = urlencode({**GMGN_SWAP_ROUTE_PARAMS, "from_address": self._cfg.wallet_public_key})
         self.paper_mode = paper_mode  # This flag no longer changes order simulation
         self.virtual_balance = 1  # Starting with 1 SOL
         self.positions = {}  # Track virtual positions
+        self._holdings_value = 0  # Running sum of position * price, updated on each trade
+        self._positions_lock = threading.Lock()  # Guards balance, positions and prices against print_stats reads
         self.market_data = {}  # Store market data from WebSocket
         self.token_prices = {}  # Track token prices
-        self.token_volumes = {}  # Track token volumes
-        self.analyzed_tokens = {}  # Cache for analyzed tokens
+        self.analyzed_tokens = OrderedDict()  # LRU cache for analyzed tokens
+        self.analysis_cache_size = 10000  # Maximum number of cached analyses
+        self.cache_save_interval = 60  # Minimum seconds between cache writes
+        self._cache_dirty = False  # Whether the cache changed since it was last saved
+        self._last_cache_save = 0.0
+        self._analysis_lock = threading.Lock()  # Guards analyzed_tokens, which worker threads also update
         self.analysis_cache_time = 300  # Cache analysis results for 5 minutes
+        # Runs the main loop's contract examinations concurrently, using the per-host budget not reserved for new tokens
+        self._executor = ThreadPoolExecutor(max_workers=MAX_REQUESTS_PER_HOST - NEW_TOKEN_WORKERS, thread_name_prefix="examine")
+        # Examines tokens from creation events, so a burst of them never delays the main loop's examinations
+        self._new_token_executor = ThreadPoolExecutor(max_workers=NEW_TOKEN_WORKERS, thread_name_prefix="new-token")
+        self._order_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orders")  # Executes orders one at a time, in submission order
+        self._host_not_before = {}  # Host -> monotonic time before which no request may be sent
+        self._host_not_before_lock = threading.Lock()
+        self._inflight_examinations = {}  # Token address -> Future for examinations in progress
+        self._queued_new_tokens = set()  # Tokens submitted to the new-token pool and not yet finished
+        self._inflight_lock = threading.Lock()  # Guards _inflight_examinations and _queued_new_tokens
+        self._stop = threading.Event()  # Set to shut the bot down cleanly
+        self._wake = threading.Event()  # Set when the main loop has work before its next tick
+        self._rx_queue = queue.SimpleQueue()  # Raw WebSocket frames awaiting dispatch
+        self._ws = None  # Currently open WebSocketApp, if any
+        # WebSocket event type -> handler
+        self._handlers = {
+            'newToken': self.handle_new_token,
+            'tokenTrade': self.handle_token_trade,
+            'accountTrade': self.handle_account_trade,
+            'raydiumLiquidity': self.handle_raydium_liquidity
+        }
         
         # Trading parameters - lowered thresholds for testing
         self.min_volume_threshold = 0.01  # Lowered to 0.01 SOL volume
         self.position_size = 0.1  # 10% of balance per trade
         self.min_price_change = 0.01  # Lowered to 1% minimum price change
+        self.min_market_cap_threshold = float(os.getenv("MIN_MARKET_CAP_SOL", "30"))  # SOL
+        self._momentum_denom = self.min_market_cap_threshold * 10  # Market cap scoring a full 1.0
         
         # Setup separate logging for market data
         self.market_logger = self.setup_market_logger()
@@ -64,16 +264,40 @@ class PumpFunBot:
         # Setup general logging to file
         self.setup_logging()
 
+        # Reuse still-fresh analyses from a previous run
+        self.load_cache_from_file()
+        self._cache_dirty = False
+
+        # Open the GMGN connection in the background so the first examination skips the handshake
+        self._executor.submit(self.warm_connections)
+
     def setup_logging(self):
         """
-        Sets up logging to a file for all logs.
+        Sets up logging to the console and a file for all logs.
+        PUMPFUN_LOG_LEVEL=INFO skips formatting of the per-event debug records.
         """
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-        file_handler = logging.FileHandler('trading_bot.log')
-        file_handler.setLevel(logging.DEBUG)
+        root_logger = logging.getLogger()
+        if root_logger.handlers:
+            return
+        root_logger.setLevel(os.getenv("PUMPFUN_LOG_LEVEL", "DEBUG").upper())
+        
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        logging.getLogger().addHandler(file_handler)
+        handlers = [logging.StreamHandler(), logging.FileHandler('trading_bot.log')]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        root_logger.addHandler(self._start_log_listener(handlers))
+
+    def _start_log_listener(self, handlers):
+        """
+        Starts a background thread that owns the given handlers and returns a
+        QueueHandler feeding it, so logging calls never block on console or file I/O.
+        """
+        log_queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        return logging.handlers.QueueHandler(log_queue)
 
     def setup_market_logger(self):
         """
@@ -81,6 +305,10 @@ class PumpFunBot:
         """
         market_logger = logging.getLogger('market_data')
         market_logger.setLevel(logging.INFO)
+        # Keep market records out of the root handlers so they are emitted once
+        market_logger.propagate = False
+        if market_logger.handlers:
+            return market_logger
         
         # Create a file handler
         fh = logging.FileHandler('market_data.log')
@@ -95,17 +323,78 @@ class PumpFunBot:
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
         
-        # Add the handlers to logger
-        market_logger.addHandler(fh)
-        market_logger.addHandler(ch)
+        # Hand the handlers to a background listener
+        market_logger.addHandler(self._start_log_listener([fh, ch]))
         
         return market_logger
 
+    def _wait_for_host(self, host):
+        """
+        Blocks until the host's back-off deadline has passed.
+        Returns False if the bot was stopped instead.
+        """
+        while True:
+            with self._host_not_before_lock:
+                delay = self._host_not_before.get(host, 0) - time.monotonic()
+            if delay <= 0:
+                return not self._stop.is_set()
+            if self._stop.wait(delay):
+                return False
+
+    def _request(self, method, url, **kwargs):
+        """
+        Performs a request through the shared session, honoring per-host back-off.
+        If the server asks us to back off, every later request to that host waits
+        out the (capped) Retry-After, not just the one that was throttled.
+        """
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        host = urlsplit(url).netloc
+        if not self._wait_for_host(host):
+            raise requests.ConnectionError(f"Not requesting {host}: bot is stopping")
+        
+        response = self.session.request(method, url, **kwargs)
+        
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            log.debug("Rate limit remaining for %s: %s", url, remaining)
+        
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = min(int(retry_after), MAX_RETRY_AFTER)
+            except ValueError:
+                delay = 0
+            if delay > 0:
+                log.warning("Rate limited by %s, backing off for %s seconds", host, delay)
+                not_before = time.monotonic() + delay
+                with self._host_not_before_lock:
+                    if not_before > self._host_not_before.get(host, 0):
+                        self._host_not_before[host] = not_before
+        
+        return response
+
+    def _get(self, url, **kwargs):
+        """
+        Performs a GET through the shared session, honoring per-host back-off.
+        """
+        return self._request('GET', url, **kwargs)
+
+    def warm_connections(self):
+        """
+        Establishes a pooled connection to the GMGN API ahead of the first examination.
+        """
+        origin = urlsplit(self._cfg.swap_route_url)
+        try:
+            self._request('HEAD', f"{origin.scheme}://{origin.netloc}/")
+            log.debug("Warmed connection to %s", origin.netloc)
+        except requests.RequestException as e:
+            log.debug("Connection warmup to %s failed: %s", origin.netloc, e)
+
     def get_market_data(self):
         """
         Returns the current market data collected from WebSocket feeds.
         """
-        logging.debug(f"Current market data: {self.market_data}")
+        log.debug("Current market data: %s", self.market_data)
         return self.market_data
 
     def place_order(self, coin: str, side: str, quantity: float, price: float):
@@ -113,9 +402,21 @@ class PumpFunBot:
         Places an order for a given token.
         In this updated version, whether the bot is in paper mode or not,
         the order is simulated (i.e. no API call is made).
+        Orders are queued to a single dispatcher thread so concurrent callers
+        can't race on the balance; returns a Future for the order's completion.
         """
-        logging.info(f"{LogColors.OKBLUE}Simulating {side} order for {coin}: quantity={quantity}, price={price}{LogColors.ENDC}")
-        self.simulate_trade(coin, side, quantity, price)
+        log.info(LogColors.OKBLUE + "Simulating %s order for %s: quantity=%s, price=%s" + LogColors.ENDC, side, coin, quantity, price)
+        future = self._order_executor.submit(self.simulate_trade, coin, side, quantity, price)
+        future.add_done_callback(self._log_order_failure)
+        return future
+
+    @staticmethod
+    def _log_order_failure(future):
+        """
+        Logs an order that raised, since callers usually don't wait on the order's Future.
+        """
+        if not future.cancelled() and future.exception() is not None:
+            log.error(LogColors.FAIL + "Order failed: %r" + LogColors.ENDC, future.exception())
 
     def simulate_trade(self, coin: str, side: str, quantity: float, price: float):
         """
@@ -123,132 +424,189 @@ class PumpFunBot:
         This simulation is identical regardless of mode.
         """
         try:
+            # A sell is a buy of negative quantity, so both sides share one update path
             if side == 'buy':
-                cost = quantity * price
-                if self.virtual_balance >= cost:
-                    self.virtual_balance -= cost
-                    self.positions[coin] = self.positions.get(coin, 0) + quantity
-                    self.token_prices[coin] = price  # Store purchase price
-                    logging.info(
-                        f"{LogColors.OKCYAN}\n=== SIMULATED BUY ===\n"
-                        f"Token: {coin}\n"
-                        f"Quantity: {quantity:.4f}\n"
-                        f"Price: ◎{price:.4f}\n"
-                        f"Cost: ◎{cost:.4f}\n"
-                        f"New Balance: ◎{self.virtual_balance:.4f}\n"
-                        f"Positions: {self.positions}\n"
-                        f"Token Prices: {self.token_prices}{LogColors.ENDC}"
-                    )
-                else:
-                    logging.warning(f"{LogColors.WARNING}Insufficient balance for simulated buy: {cost} > {self.virtual_balance}{LogColors.ENDC}")
+                signed_quantity = quantity
             elif side == 'sell':
-                if coin in self.positions and self.positions[coin] >= quantity:
-                    proceeds = quantity * price
-                    self.virtual_balance += proceeds
-                    self.positions[coin] -= quantity
-                    if self.positions[coin] <= 0:
-                        del self.positions[coin]
-                        del self.token_prices[coin]
-                    logging.info(
-                        f"{LogColors.OKCYAN}\n=== SIMULATED SELL ===\n"
-                        f"Token: {coin}\n"
-                        f"Quantity: {quantity:.4f}\n"
-                        f"Price: ◎{price:.4f}\n"
-                        f"Proceeds: ◎{proceeds:.4f}\n"
-                        f"New Balance: ◎{self.virtual_balance:.4f}\n"
-                        f"Positions: {self.positions}\n"
-                        f"Token Prices: {self.token_prices}{LogColors.ENDC}"
-                    )
+                signed_quantity = -quantity
+            else:
+                log.warning(LogColors.WARNING + "Invalid side for simulated trade on %s: %r" + LogColors.ENDC, coin, side)
+                return
+            
+            with self._positions_lock:
+                cost = signed_quantity * price  # Negative for sells: the proceeds
+                new_balance = self.virtual_balance - cost
+                new_position = self.positions.get(coin, 0) + signed_quantity
+                
+                if new_balance < 0:
+                    log.warning(LogColors.WARNING + "Insufficient balance for simulated buy: %s > %s" + LogColors.ENDC, cost, self.virtual_balance)
+                    return
+                if new_position < 0:
+                    log.warning(LogColors.WARNING + "Insufficient position for simulated sell: %s position: %s" + LogColors.ENDC, coin, self.positions.get(coin, 0))
+                    return
+                
+                old_value = self._position_value(coin)
+                self.virtual_balance = new_balance
+                if new_position > 0:
+                    self.positions[coin] = new_position
+                    if signed_quantity > 0:
+                        self.token_prices[coin] = price  # Store purchase price
                 else:
-                    logging.warning(f"{LogColors.WARNING}Insufficient position for simulated sell: {coin} position: {self.positions.get(coin, 0)}{LogColors.ENDC}")
+                    self.positions.pop(coin, None)
+                    self.token_prices.pop(coin, None)
+                self._holdings_value += self._position_value(coin) - old_value
+                if not self.positions:
+                    self._holdings_value = 0  # Drop accumulated rounding error
+                
+                log.info(_BUY_TMPL if signed_quantity > 0 else _SELL_TMPL,
+                         coin, quantity, price, abs(cost), self.virtual_balance, self.positions, self.token_prices)
         except Exception as e:
-            logging.error(f"{LogColors.FAIL}Error in simulate_trade: {e}{LogColors.ENDC}")
+            log.error(LogColors.FAIL + "Error in simulate_trade: %s" + LogColors.ENDC, e)
             raise e
 
+    def _position_value(self, coin):
+        """
+        Returns the value of the current position in a token at its stored price.
+        """
+        return self.positions.get(coin, 0) * self.token_prices.get(coin, 0)
+
     def connect_to_websocket(self):
         """
         Connects to the PumpPortal WebSocket for real-time data.
+        Reconnects with exponential backoff whenever the connection drops.
         """
-        ws = websocket.WebSocketApp(
-            "wss://pumpportal.fun/api/data",
-            on_message=self.on_message,
-            on_error=self.on_error,
-            on_close=self.on_close
-        )
-        ws.on_open = self.on_open
-        ws.run_forever()
+        backoff = 1
+        while not self._stop.is_set():
+            connected_at = time.monotonic()
+            try:
+                self._ws = websocket.WebSocketApp(
+                    self._cfg.ws_url,
+                    on_message=self.on_message,
+                    on_error=self.on_error,
+                    on_close=self.on_close
+                )
+                self._ws.on_open = self.on_open
+                
+                # Ping keeps idle connections from being silently dropped; frames are
+                # validated by the JSON parser, so skip the pure-Python UTF-8 check
+                self._ws.run_forever(
+                    ping_interval=20, ping_timeout=10, skip_utf8_validation=True, sockopt=_WS_SOCKOPT
+                )
+            except Exception:
+                log.exception("WebSocket connection failed")
+            
+            if self._stop.is_set():
+                break
+            
+            # Reset the backoff once a connection has stayed up for a while
+            if time.monotonic() - connected_at > 60:
+                backoff = 1
+            log.warning("WebSocket disconnected. Reconnecting in %s seconds...", backoff)
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 60)
 
     def on_message(self, ws, message):
         """
-        Handles incoming WebSocket messages.
+        Queues an incoming WebSocket message for the dispatcher thread.
+        Keeps the receive thread free to drain the socket during bursts.
+        Every frame is kept: new-token events are the bot's main input.
+        """
+        self._rx_queue.put(message)
+
+    def dispatch_messages(self):
+        """
+        Drains queued WebSocket messages in batches and handles them.
+        Blocks for the first message, then takes everything already queued, so a
+        burst costs one blocking wakeup rather than one per frame.
+        """
+        rx_get = self._rx_queue.get
+        rx_get_nowait = self._rx_queue.get_nowait
+        process = self.process_message
+        while not self._stop.is_set():
+            try:
+                batch = [rx_get(timeout=1)]
+            except queue.Empty:
+                continue
+            try:
+                while True:
+                    batch.append(rx_get_nowait())
+            except queue.Empty:
+                pass
+            
+            if len(batch) > RX_BACKLOG_WARN:
+                log.warning("Dispatcher is falling behind: %s frames were queued", len(batch))
+            for message in batch:
+                process(message)
+            log.debug("Dispatched a batch of %s frames", len(batch))
+
+    def process_message(self, message):
+        """
+        Handles a single WebSocket message.
         """
         try:
-            data = json.loads(message)
-            # Log the raw message for debugging
-            logging.debug(f"Raw WebSocket message: {message}")
+            data = orjson.loads(message)
+            # Log the raw message for debugging; only decode it when the record will be emitted
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Raw WebSocket message: %s", _frame_text(message))
             
-            # Handle known message patterns
-            if 'message' in data:
-                logging.info(f"Info message received: {data['message']}")
+            # Handle info, error and subscription confirmation messages with a single key probe
+            if not data.keys().isdisjoint(_CONTROL_KEYS):
+                if 'message' in data:
+                    log.info("Info message received: %s", data['message'])
+                elif 'errors' in data:
+                    log.error("Error message received: %s", data['errors'])
+                else:
+                    log.info("Subscription response: %s", data)
                 return
             
-            if 'errors' in data:
-                logging.error(f"Error message received: {data['errors']}")
-                return
+            data_get = data.get
             
             # Attempt to process messages without an explicit event type
-            if 'txType' in data and data['txType'] == 'create':
-                logging.info(f"Processing token creation event for: {data.get('symbol', 'Unknown')}")
+            if data_get('txType') == 'create':
+                log.info("Processing token creation event for: %s", data_get('symbol', 'Unknown'))
                 self.handle_new_token(data)
                 return
-            
-            # Check if this is a subscription confirmation
-            if 'result' in data:
-                logging.info(f"Subscription response: {data}")
-                return
                 
-            event_type = data.get('type')
+            event_type = data_get('type')
             if not event_type:
                 # Log the entire message if no event type is found
-                logging.warning(f"Message received without event type: {data}")
+                log.warning("Message received without event type: %s", data)
                 return
                 
-            if event_type == 'newToken':
-                self.handle_new_token(data)
-            elif event_type == 'tokenTrade':
-                self.handle_token_trade(data)
-            elif event_type == 'accountTrade':
-                self.handle_account_trade(data)
-            elif event_type == 'raydiumLiquidity':
-                self.handle_raydium_liquidity(data)
+            handler = self._handlers.get(event_type)
+            if handler:
+                handler(data)
             else:
-                logging.warning(f"Unknown event type received: {event_type}")
+                log.warning("Unknown event type received: %s", event_type)
             
-            logging.info(f"Processed {event_type} event")
-            self.print_stats()  # Print stats after processing each event
-        except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse WebSocket message: {e}")
-            logging.error(f"Raw message was: {message}")
+            log.debug("Processed %s event", event_type)
+        except ValueError as e:  # orjson.JSONDecodeError subclasses ValueError
+            log.error("Failed to parse WebSocket message: %s", e)
+            log.error("Raw message was: %s", _frame_text(message))
         except Exception as e:
-            logging.error(f"Error processing WebSocket message: {e}")
-            logging.error(f"Message was: {message}")
+            log.error("Error processing WebSocket message: %s", e)
+            log.error("Message was: %s", _frame_text(message))
 
     def on_open(self, ws):
         """
         Handles WebSocket connection opening and subscribes to desired streams.
         """
-        logging.info("WebSocket connection opened")
+        log.info("WebSocket connection opened")
         
-        # Subscribe to different data streams
-        subscriptions = [
-            {"method": "subscribeNewToken"},
-            {"method": "subscribeTokenTrade", "params": ["ALL"]},  # or specific tokens
-            {"method": "subscribeRaydiumLiquidity"}
-        ]
+        # Cork the socket (Linux) so the subscription frames leave in as few segments as possible
+        sock = getattr(ws.sock, 'sock', None)
+        cork = sock is not None and hasattr(socket, 'TCP_CORK')
+        if cork:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+        try:
+            # Subscribe to different data streams; bytes go out unchanged as text frames
+            for frame in _SUBSCRIPTION_FRAMES:
+                ws.send(frame)
+        finally:
+            if cork:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
         
-        for sub in subscriptions:
-            ws.send(json.dumps(sub))
-            logging.info(f"Subscribed to {sub['method']}")
+        log.info("Subscribed to %s", _SUBSCRIPTION_METHODS)
 
     def handle_new_token(self, data):
         """
@@ -256,7 +614,10 @@ class PumpFunBot:
         """
         token_address = data.get('mint')
         symbol = data.get('symbol', 'Unknown')
-        logging.info(f"New token created: {symbol} ({token_address})")
+        if not token_address or not isinstance(token_address, str):
+            log.warning("Ignoring token creation event without a mint address: %s", data)
+            return
+        log.info("New token created: %s (%s)", symbol, token_address)
         
         # Update market data with initial information
         self.market_data[token_address] = {
@@ -265,29 +626,53 @@ class PumpFunBot:
             'initial_buy': data.get('initialBuy', 0),
             'sol_amount': data.get('solAmount', 0),
             'market_cap_sol': data.get('marketCapSol', 0),
-            'last_trade': time.time()
+            'last_trade': time.monotonic()
         }
         
         # Log the market data for debugging
-        logging.debug(f"Market data updated for {symbol}: {self.market_data[token_address]}")
+        log.debug("Market data updated for %s: %s", symbol, self.market_data[token_address])
         
-        # Add your token analysis logic here
-        self.examine_token_contract(token_address)
-        
-        # Ensure the token is analyzed
-        if self.should_analyze_token(token_address):
-            logging.info(f"{LogColors.OKBLUE}Analyzing token: {symbol}{LogColors.ENDC}")
+        # Examine off the WebSocket thread so slow HTTP never stalls message handling
+        with self._inflight_lock:
+            if token_address in self._queued_new_tokens:
+                return
+            backlogged = len(self._queued_new_tokens) >= NEW_TOKEN_BACKLOG
+            if not backlogged:
+                self._queued_new_tokens.add(token_address)
+        if backlogged:
+            # Only these tokens wake the main loop; it examines whatever the new-token pool has no room for
+            log.debug("New-token examinations backlogged, leaving %s to the main loop", token_address)
+            self._wake.set()
+            return
+        self._new_token_executor.submit(self._examine_and_trade, token_address, symbol)
+
+    def _examine_and_trade(self, token_address, symbol):
+        """
+        Examines a newly created token and trades it if it has enough data.
+        Runs on the new-token pool rather than the WebSocket thread.
+        """
+        try:
+            # Skip tokens whose examination result is still cached
+            if not self.should_analyze_token(token_address):
+                log.info(LogColors.WARNING + "Token %s does not need analysis (cached)." + LogColors.ENDC, symbol)
+                return
+            
+            # Add your token analysis logic here; the result is recorded in the analysis cache
+            self.examine_token_contract(token_address)
+            
+            log.info(LogColors.OKBLUE + "Analyzing token: %s" + LogColors.ENDC, symbol)
             token_data = self.market_data.get(token_address, {})
             if token_data:
                 # Check if all necessary data is present
                 if 'price' in token_data and 'volume' in token_data:
                     self.execute_momentum_trade(token_data)
                 else:
-                    logging.warning(f"{LogColors.WARNING}Insufficient data for executing trade on {symbol}. Missing price or volume.{LogColors.ENDC}")
+                    log.warning(LogColors.WARNING + "Insufficient data for executing trade on %s. Missing price or volume." + LogColors.ENDC, symbol)
             else:
-                logging.warning(f"{LogColors.WARNING}No token data available for {symbol} during trade execution.{LogColors.ENDC}")
-        else:
-            logging.info(f"{LogColors.WARNING}Token {symbol} does not need analysis (cached).{LogColors.ENDC}")
+                log.warning(LogColors.WARNING + "No token data available for %s during trade execution." + LogColors.ENDC, symbol)
+        finally:
+            with self._inflight_lock:
+                self._queued_new_tokens.discard(token_address)
 
     def handle_token_trade(self, data):
         """
@@ -295,28 +680,31 @@ class PumpFunBot:
         """
         token = data.get('mint')
         market_cap = data.get('marketCapSol')
+        if not isinstance(market_cap, (int, float)):
+            # Nothing to record or trade on, and the lazy %f in the trade log can't format it
+            log.debug("Ignoring trade for %s without a numeric market cap: %r", token, market_cap)
+            return
         
-        if token:
-            # Update market data
-            self.market_data[token] = {
-                'market_cap': market_cap,
-                'address': token,
-                'last_trade': time.time(),
-                'symbol': data.get('symbol', 'Unknown')
-            }
+        if token and isinstance(token, str):
+            # Update market data in place rather than allocating a new entry per trade
+            token_data = self.market_data.get(token)
+            if token_data is None:
+                token_data = self.market_data[token] = {
+                    'address': token,
+                    'symbol': data.get('symbol', 'Unknown')
+                }
+            token_data['market_cap'] = market_cap
+            token_data['last_trade'] = time.monotonic()
             
             # Log market data separately
-            self.market_logger.info(
-                f"TRADE | Token: {token[:12]:<12} | "
-                f"Market Cap: ◎{market_cap:<10.4f}"
-            )
+            self.market_logger.info("TRADE | Token: %-12.12s | Market Cap: ◎%-10.4f", token, market_cap)
             
             # Ensure the token is analyzed
             if self.should_analyze_token(token):
-                logging.info(f"{LogColors.OKBLUE}Analyzing token: {token}{LogColors.ENDC}")
-                self.execute_momentum_trade(self.market_data[token])
+                log.info(LogColors.OKBLUE + "Analyzing token: %s" + LogColors.ENDC, token)
+                self.execute_momentum_trade(token_data)
             else:
-                logging.info(f"{LogColors.WARNING}Token {token} does not need analysis (cached).{LogColors.ENDC}")
+                log.info(LogColors.WARNING + "Token %s does not need analysis (cached)." + LogColors.ENDC, token)
 
     def handle_account_trade(self, data):
         """
@@ -325,7 +713,7 @@ class PumpFunBot:
         account = data.get('account')
         token = data.get('token')
         side = data.get('side')
-        logging.info(f"Account {account} {side} {token}")
+        log.info("Account %s %s %s", account, side, token)
         # Add your account tracking logic here
 
     def handle_raydium_liquidity(self, data):
@@ -334,7 +722,7 @@ class PumpFunBot:
         """
         token = data.get('token')
         amount = data.get('amount')
-        logging.info(f"Liquidity added to Raydium for {token}: {amount}")
+        log.info("Liquidity added to Raydium for %s: %s", token, amount)
         # Add your liquidity analysis logic here
 
     def analyze_tokens(self, min_liquidity: float, min_volume: float, min_holders: int):
@@ -346,7 +734,7 @@ class PumpFunBot:
         """
         market_data = self.get_market_data()
         if not market_data:
-            logging.error("No market data available for analysis.")
+            log.error("No market data available for analysis.")
             return []
 
         promising_tokens = []
@@ -358,10 +746,43 @@ class PumpFunBot:
             if liquidity >= min_liquidity and volume >= min_volume and holders >= min_holders:
                 promising_tokens.append(data)
 
-        logging.info(f"Found {len(promising_tokens)} promising tokens based on filters.")
+        log.info("Found %s promising tokens based on filters.", len(promising_tokens))
         return promising_tokens
 
     def examine_token_contract(self, token_address):
+        """
+        Examines the token contract, deduplicating concurrent requests.
+        If the same token is already being examined (e.g. by the WebSocket handler
+        and the main loop at once), waits for that result instead of fetching again.
+        The result is recorded in the analysis cache before other callers are released.
+        """
+        with self._inflight_lock:
+            future = self._inflight_examinations.get(token_address)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight_examinations[token_address] = Future()
+        
+        if not is_owner:
+            return future.result()
+        
+        try:
+            # Another caller may have examined and recorded the token since our caller checked the cache
+            result = self._cached_result(token_address)
+            if result is None:
+                result = self._examine_token_contract(token_address)
+                # Results cut short by shutdown aren't worth remembering
+                if not self._stop.is_set():
+                    self.remember_analysis(token_address, TokenAnalysis(time.monotonic(), result))
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight_examinations[token_address]
+
+    def _examine_token_contract(self, token_address):
         """
         Examines the token contract using the GMGN API.
         Retries if the token is too new to be examined.
@@ -369,45 +790,62 @@ class PumpFunBot:
         max_retries = 5
         retry_delay = 7200  # 2 hours in seconds
 
+        if not token_address or not isinstance(token_address, str):
+            log.warning("Cannot examine token contract: invalid address %r", token_address)
+            return False
+
+        api_url = f"{self._cfg.swap_route_url}?token_in_address={quote(token_address, safe='')}&{self._swap_route_query}"
+        
         for attempt in range(max_retries):
             try:
-                api_url = (
-                    f"https://gmgn.ai/defi/router/v1/sol/tx/get_swap_route?"
-                    f"token_in_address={token_address}&"
-                    f"token_out_address=So11111111111111111111111111111111111111112&"
-                    f"in_amount=100000000&"
-                    f"from_address={WALLET_PUBLIC_KEY}&"
-                    f"slippage=5.0"
-                )
-                logging.debug(f"API Request URL: {api_url}")
-                response = self.session.get(api_url)
+                log.debug("API Request URL: %s", api_url)
+                response = self._get(api_url)
                 
                 if response.status_code != 200:
-                    logging.warning(f"Non-200 response for token contract examination: {response.status_code}")
+                    log.warning("Non-200 response for token contract examination: %s", response.status_code)
                     return False
                 
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data.get('code') == 0:
-                    logging.info(f"Token {token_address} contract examination successful.")
+                    log.info("Token %s contract examination successful.", token_address)
                     return True
                 else:
                     error_message = data.get('msg', 'Unknown error')
                     if "jupiter has no route" in error_message:
-                        logging.warning(f"Token {token_address} examination failed: No route available for swap.")
+                        log.warning("Token %s examination failed: No route available for swap.", token_address)
                     else:
-                        logging.warning(f"Token {token_address} contract examination failed: {error_message}")
+                        log.warning("Token %s contract examination failed: %s", token_address, error_message)
                     return False
-            except requests.RequestException as e:
-                logging.error(f"Failed to examine token contract: {e}")
+            except (requests.RequestException, orjson.JSONDecodeError) as e:
+                log.error("Failed to examine token contract: %s", e)
                 return False
 
             # If the token is too new, wait and retry
-            logging.info(f"Token {token_address} is too new for examination. Retrying in {retry_delay} seconds...")
+            log.info("Token %s is too new for examination. Retrying in %s seconds...", token_address, retry_delay)
             time.sleep(retry_delay)
 
-        logging.warning(f"Token {token_address} could not be examined after {max_retries} attempts.")
+        log.warning("Token %s could not be examined after %s attempts.", token_address, max_retries)
         return False
 
+    def examine_token_contracts(self, token_addresses):
+        """
+        Examines a batch of token contracts concurrently over the shared session.
+        Returns a dict mapping each token address to its examination result;
+        a token whose examination raised is reported as failed without losing the rest.
+        """
+        futures = {
+            token_address: self._executor.submit(self.examine_token_contract, token_address)
+            for token_address in token_addresses
+        }
+        results = {}
+        for token_address, future in futures.items():
+            try:
+                results[token_address] = future.result()
+            except Exception:
+                log.exception("Examination of token %s failed", token_address)
+                results[token_address] = False
+        return results
+
     def is_token_risky(self, distribution, contract_methods):
         """
         Determines if a token is risky based on its distribution and contract methods.
@@ -425,7 +863,7 @@ class PumpFunBot:
         """
         # Placeholder for database logic
         # e.g., self.database.insert(token_address, token_details)
-        logging.info(f"Token {token_address} added to the database.")
+        log.info("Token %s added to the database.", token_address)
 
     def add_to_final_database(self, token_address, token_details):
         """
@@ -433,7 +871,7 @@ class PumpFunBot:
         """
         # Placeholder for final database logic
         # e.g., self.final_database.insert(token_address, token_details)
-        logging.info(f"Token {token_address} added to the final database for trading.")
+        log.info("Token %s added to the final database for trading.", token_address)
 
     def calculate_momentum(self, token_data):
         """
@@ -441,28 +879,29 @@ class PumpFunBot:
         Returns a score between 0 and 1.
         """
         if not token_data:
-            logging.debug("No token data provided")
+            log.debug("No token data provided")
             return 0
 
         market_cap = token_data.get('market_cap', 0)
         
-        logging.debug(f"Analyzing token: Market Cap={market_cap}")
+        log.debug("Analyzing token: Market Cap=%s", market_cap)
         
         # Skip if basic requirements aren't met
         if market_cap <= 0:
-            logging.debug("Skipping: Market Cap <= 0")
+            log.debug("Skipping: Market Cap <= 0")
             return 0
             
         # Calculate market cap score (0-1)
-        market_cap_score = min(market_cap / (self.min_market_cap_threshold * 10), 1)
+        market_cap_score = min(market_cap / self._momentum_denom, 1)
         
         # Combined score (100% market cap)
         momentum_score = market_cap_score
         
-        logging.info(
-            f"Momentum analysis for {token_data.get('symbol')}: \n"
-            f"  Market Cap: ◎{market_cap:.4f} (Score: {market_cap_score:.2f})\n"
-            f"  Total Score: {momentum_score:.2f}"
+        log.info(
+            "Momentum analysis for %s: \n"
+            "  Market Cap: ◎%.4f (Score: %.2f)\n"
+            "  Total Score: %.2f",
+            token_data.get('symbol'), market_cap, market_cap_score, momentum_score
         )
         
         return momentum_score
@@ -477,176 +916,312 @@ class PumpFunBot:
             
             # Example trade logic based on market cap
             if market_cap > self.min_market_cap_threshold:
-                logging.info(f"{LogColors.OKGREEN}Executing trade for {symbol} with market cap {market_cap}.{LogColors.ENDC}")
+                log.info(LogColors.OKGREEN + "Executing trade for %s with market cap %s." + LogColors.ENDC, symbol, market_cap)
                 # Simulate or place a real order
                 self.place_order(symbol, 'buy', self.position_size, market_cap)
             else:
-                logging.info(f"{LogColors.WARNING}Trade conditions not met for {symbol}. Market Cap: {market_cap}{LogColors.ENDC}")
+                log.info(LogColors.WARNING + "Trade conditions not met for %s. Market Cap: %s" + LogColors.ENDC, symbol, market_cap)
         except Exception as e:
-            logging.error(f"{LogColors.FAIL}Error executing momentum trade: {e}{LogColors.ENDC}")
+            log.error(LogColors.FAIL + "Error executing momentum trade: %s" + LogColors.ENDC, e)
 
     def on_error(self, ws, error):
         """
         Handles WebSocket errors.
         """
-        logging.error(f"WebSocket error: {error}")
+        log.error("WebSocket error: %s", error)
 
     def on_close(self, ws, close_status_code, close_msg):
         """
         Handles WebSocket connection closing.
         """
-        logging.info("WebSocket connection closed")
+        log.info("WebSocket connection closed")
 
     def print_stats(self):
         """
         Prints trading statistics without clearing the console.
         """
         try:
-            # Calculate values with debug logging
-            holdings_value = 0
-            holdings_details = []
+            # Copy the portfolio, which simulate_trade updates on the orders thread
+            with self._positions_lock:
+                virtual_balance = self.virtual_balance
+                holdings_value = self._holdings_value  # Maintained incrementally by simulate_trade
+                positions = dict(self.positions)
+                token_prices = dict(self.token_prices)
+            holdings_rows = []
+            
+            # Bind lookups used per position to locals
+            token_price = token_prices.get
+            row_tmpl = _HOLDING_ROW_TMPL
+            append_row = holdings_rows.append
             
-            for token, amount in self.positions.items():
-                market_cap = self.token_prices.get(token, 0)
+            for token, amount in positions.items():
+                market_cap = token_price(token, 0)
                 value = amount * market_cap
-                holdings_value += value
                 
                 if amount > 0:
-                    holdings_details.append({
-                        'token': token,
-                        'amount': amount,
-                        'market_cap': market_cap,
-                        'value': value
-                    })
-                    logging.debug(f"Position: {token} - Amount: {amount}, Market Cap: {market_cap}, Value: {value}")
+                    append_row(row_tmpl % (token, amount, market_cap, value))
+                    log.debug("Position: %s - Amount: %s, Market Cap: %s, Value: %s", token, amount, market_cap, value)
             
-            total_value = self.virtual_balance + holdings_value
+            total_value = virtual_balance + holdings_value
             current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
             
             # Debug state
-            logging.debug(f"Virtual Balance: {self.virtual_balance}")
-            logging.debug(f"Holdings Value: {holdings_value}")
-            logging.debug(f"Total Value: {total_value}")
-            logging.debug(f"Current Positions: {self.positions}")
-            logging.debug(f"Token Prices: {self.token_prices}")
+            log.debug("Virtual Balance: %s", virtual_balance)
+            log.debug("Holdings Value: %s", holdings_value)
+            log.debug("Total Value: %s", total_value)
+            log.debug("Current Positions: %s", positions)
+            log.debug("Token Prices: %s", token_prices)
             
             # Format the statistics
-            stats = f"""
-{LogColors.HEADER}╔══════════════════════════════════════════════════════════════════╗
-║                     PumpFun Trading Bot Stats                     ║
-╠═══════════════════════════════╦══════════════════════════════════╣
-║ ACCOUNT SUMMARY               ║ TRADING ACTIVITY                  ║
-╟───────────────────────────────╫──────────────────────────────────╢
-║ Virtual Balance: ◎{self.virtual_balance:<10.4f} ║ Paper Mode: {str(self.paper_mode):<19} ║
-║ Holdings Value:  ◎{holdings_value:<10.4f} ║ Active Tokens: {len(self.positions):<16} ║
-║ Total Value:     ◎{total_value:<10.4f} ║ Last Update: {current_time}  ║
-╠═══════════════════════════════╩══════════════════════════════════╣
-║ CURRENT HOLDINGS                                                 ║
-╟──────────────────────────────────────────────────────────────────╢{LogColors.ENDC}"""
-
-            # Add holdings details
-            if holdings_details:
-                for holding in holdings_details:
-                    stats += f"\n{LogColors.OKBLUE}║ {holding['token'][:12]:<12} │ Amount: {holding['amount']:<10.4f} │ Market Cap: ◎{holding['market_cap']:<8.4f} │ ◎{holding['value']:<10.4f} ║{LogColors.ENDC}"
-            else:
-                stats += f"\n{LogColors.WARNING}║ No active positions                                              ║{LogColors.ENDC}"
-
-            stats += f"\n{LogColors.HEADER}╚══════════════════════════════════════════════════════════════════╝{LogColors.ENDC}"
+            stats = _STATS_TMPL % (
+                virtual_balance, str(self.paper_mode),
+                holdings_value, len(positions),
+                total_value, current_time,
+                "".join(holdings_rows) or _NO_HOLDINGS_ROW
+            )
             
-            print(stats)
+            # One write and flush instead of print()'s separate writes for the text and newline
+            sys.stdout.write(stats)
+            sys.stdout.flush()
             
         except Exception as e:
-            logging.error(f"Error in print_stats: {e}")
-            logging.error(f"Current state - Balance: {self.virtual_balance}, Positions: {self.positions}")
+            log.error("Error in print_stats: %s", e)
+            log.error("Current state - Balance: %s, Positions: %s", self.virtual_balance, self.positions)
             raise e  # Re-raise to see full traceback
 
     def should_analyze_token(self, token_address):
         """
         Determines if a token needs to be analyzed based on cache.
         """
-        last_analysis = self.analyzed_tokens.get(token_address)
-        if not last_analysis:
-            logging.debug(f"Token {token_address} needs analysis (not in cache).")
-            return True
+        with self._analysis_lock:
+            last_analysis = self.analyzed_tokens.get(token_address)
+            if not last_analysis:
+                log.debug("Token %s needs analysis (not in cache).", token_address)
+                return True
+            
+            current_time = time.monotonic()
+            if current_time - last_analysis.timestamp > self.analysis_cache_time:
+                log.debug("Token %s needs re-analysis (cache expired).", token_address)
+                return True
+            
+            self.analyzed_tokens.move_to_end(token_address)
+        log.debug("Token %s does not need analysis (cache valid).", token_address)
+        return False
+
+    def _cached_result(self, token_address):
+        """
+        Returns the cached examination result for a token, or None if it has none that is fresh.
+        """
+        with self._analysis_lock:
+            analysis = self.analyzed_tokens.get(token_address)
+        if analysis is None or time.monotonic() - analysis.timestamp > self.analysis_cache_time:
+            return None
+        return analysis.is_safe
+
+    def remember_analysis(self, token_address, analysis_result):
+        """
+        Stores an analysis result, evicting expired and least recently used entries.
+        """
+        with self._analysis_lock:
+            self.analyzed_tokens[token_address] = analysis_result
+            self.analyzed_tokens.move_to_end(token_address)
+            self._cache_dirty = True
+            
+            current_time = time.monotonic()
+            while self.analyzed_tokens:
+                oldest = next(iter(self.analyzed_tokens.values()))
+                if (len(self.analyzed_tokens) <= self.analysis_cache_size
+                        and current_time - oldest.timestamp <= self.analysis_cache_time):
+                    break
+                self.analyzed_tokens.popitem(last=False)
+
+    def load_cache_from_file(self):
+        """
+        Loads the analyzed tokens cache from a file, keeping only entries that are still fresh.
+        This lets a restarted bot skip re-examining tokens it checked recently.
+        Timestamps are stored as wall-clock time on disk and converted to monotonic time in memory.
+        """
+        try:
+            with open('analyzed_tokens_cache.json', 'rb') as f:
+                cached = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            log.error("Failed to load cache from file: %s", e)
+            return
         
-        current_time = time.time()
-        if current_time - last_analysis['timestamp'] > self.analysis_cache_time:
-            logging.debug(f"Token {token_address} needs re-analysis (cache expired).")
-            return True
+        if not isinstance(cached, dict):
+            log.error("Ignoring analyzed tokens cache: expected a JSON object, got %s", type(cached).__name__)
+            return
         
-        logging.debug(f"Token {token_address} does not need analysis (cache valid).")
-        return False
+        wall_time = time.time()
+        wall_to_monotonic = time.monotonic() - wall_time
+        for token_address, analysis in cached.items():
+            try:
+                timestamp = float(analysis.get('timestamp', 0))
+                is_safe = bool(analysis.get('is_safe', False))
+            except (AttributeError, TypeError, ValueError):
+                log.warning("Skipping malformed cache entry for %s: %r", token_address, analysis)
+                continue
+            # Entries stamped in the future are as untrustworthy as stale ones
+            if 0 <= wall_time - timestamp <= self.analysis_cache_time:
+                self.remember_analysis(token_address, TokenAnalysis(
+                    timestamp + wall_to_monotonic,
+                    is_safe
+                ))
+        log.info("Loaded %s fresh entries from analyzed tokens cache.", len(self.analyzed_tokens))
 
     def save_cache_to_file(self):
         """
         Saves the analyzed tokens cache to a file.
+        Writes to a temporary file first so a crash can't leave a truncated cache behind.
         """
         try:
-            with open('analyzed_tokens_cache.json', 'w') as f:
-                json.dump(self.analyzed_tokens, f, indent=4)
-            logging.info("Analyzed tokens cache saved to file.")
+            # Persist wall-clock timestamps so they stay meaningful across restarts
+            monotonic_to_wall = time.time() - time.monotonic()
+            with self._analysis_lock:
+                cache = {
+                    token_address: {
+                        'timestamp': analysis.timestamp + monotonic_to_wall,
+                        'is_safe': analysis.is_safe
+                    }
+                    for token_address, analysis in self.analyzed_tokens.items()
+                }
+                # Cleared with the snapshot so an analysis recorded during the write re-marks it
+                self._cache_dirty = False
+            with open('analyzed_tokens_cache.json.tmp', 'wb') as f:
+                f.write(orjson.dumps(cache))
+            os.replace('analyzed_tokens_cache.json.tmp', 'analyzed_tokens_cache.json')
+            self._last_cache_save = time.monotonic()
+            log.info("Analyzed tokens cache saved to file.")
         except Exception as e:
-            logging.error(f"Failed to save cache to file: {e}")
+            # The snapshot wasn't persisted, so keep the cache marked for the next save
+            self._cache_dirty = True
+            log.error("Failed to save cache to file: %s", e)
+
+    def start_dispatch_thread(self):
+        """
+        Starts the WebSocket message dispatcher in a separate daemon thread.
+        """
+        dispatch_thread = threading.Thread(target=self.dispatch_messages, name="dispatcher")
+        dispatch_thread.daemon = True
+        dispatch_thread.start()
+        return dispatch_thread
+
+    def start_websocket_thread(self):
+        """
+        Starts the WebSocket connection in a separate daemon thread.
+        """
+        ws_thread = threading.Thread(target=self.connect_to_websocket, name="websocket")
+        ws_thread.daemon = True
+        ws_thread.start()
+        return ws_thread
+
+    def stop(self, *args):
+        """
+        Stops the main loop and closes the WebSocket. Also usable as a signal handler.
+        """
+        log.info("Stopping PumpFun Trading Bot...")
+        self._stop.set()
+        self._wake.set()
+        if self._ws is not None:
+            self._ws.close()
 
     def run(self):
         """
         Main trading loop with optimized analysis.
         """
-        # Clear screen once at start
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # Clear screen once at start, without spawning a shell
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
         
-        logging.info("Starting PumpFun Trading Bot...")
+        log.info("Starting PumpFun Trading Bot...")
         
-        # Start WebSocket connection in a separate thread
-        import threading
-        ws_thread = threading.Thread(target=self.connect_to_websocket)
-        ws_thread.daemon = True
-        ws_thread.start()
+        # Start WebSocket connection and message dispatch in separate threads
+        dispatch_thread = self.start_dispatch_thread()
+        ws_thread = self.start_websocket_thread()
         
-        while True:
-            try:
-                self.print_stats()
+        loop_interval = 1  # Longest wait between iterations of the main loop
+        error_backoff = 1  # Grows while consecutive iterations keep failing
+        next_stats = 0  # Early wakeups don't redraw the stats more than once per interval
+        try:
+            while not self._stop.is_set():
+                # Schedule against a monotonic deadline so work done in the loop doesn't stretch the interval
+                next_tick = time.monotonic() + loop_interval
+                # Cleared before the work, so a wakeup arriving during it isn't lost
+                self._wake.clear()
+                try:
+                    # Restart the WebSocket thread if it ever dies
+                    if not ws_thread.is_alive():
+                        log.warning("WebSocket thread stopped unexpectedly. Restarting...")
+                        ws_thread = self.start_websocket_thread()
+                    if not dispatch_thread.is_alive():
+                        log.warning("Dispatcher thread stopped unexpectedly. Restarting...")
+                        dispatch_thread = self.start_dispatch_thread()
                 
-                # Process market data and execute trades
-                market_data = self.get_market_data()
-                for token_address, token_data in market_data.items():
-                    if not self.should_analyze_token(token_address):
-                        continue
-                    
-                    analysis_result = {
-                        'timestamp': time.time(),
-                        'is_safe': False
-                    }
-                    
-                    # Log the start of the legitimacy check
-                    logging.info(f"{LogColors.OKBLUE}Starting legitimacy check for token: {token_address}{LogColors.ENDC}")
-                    
-                    if self.examine_token_contract(token_address):
-                        logging.info(f"{LogColors.OKGREEN}Token {token_address} passed contract examination.{LogColors.ENDC}")
-                        analysis_result['is_safe'] = True
-                        self.execute_momentum_trade(token_data)
-                    else:
-                        logging.info(f"{LogColors.FAIL}Token {token_address} failed contract examination.{LogColors.ENDC}")
+                    if time.monotonic() >= next_stats:
+                        self.print_stats()
+                        next_stats = time.monotonic() + loop_interval
+                
+                    # Process market data and execute trades
+                    market_data = self.get_market_data()
+                    # Leave tokens already being examined to their examiner rather than waiting on it
+                    with self._inflight_lock:
+                        busy = self._queued_new_tokens | self._inflight_examinations.keys()
+                    pending = [
+                        (token_address, token_data)
+                        for token_address, token_data in list(market_data.items())
+                        if token_address not in busy and self.should_analyze_token(token_address)
+                    ]
+                
+                    # Log the start of the legitimacy checks
+                    for token_address, _ in pending:
+                        log.info(LogColors.OKBLUE + "Starting legitimacy check for token: %s" + LogColors.ENDC, token_address)
+                
+                    # Examine all pending contracts concurrently instead of one round-trip at a time
+                    results = self.examine_token_contracts(token_address for token_address, _ in pending)
+                
+                    for token_address, token_data in pending:
+                        is_safe = results[token_address]
                     
-                    self.analyzed_tokens[token_address] = analysis_result
+                        if is_safe:
+                            log.info(LogColors.OKGREEN + "Token %s passed contract examination." + LogColors.ENDC, token_address)
+                            self.execute_momentum_trade(token_data)
+                        else:
+                            log.info(LogColors.FAIL + "Token %s failed contract examination." + LogColors.ENDC, token_address)
                 
-                # Save cache to file periodically
-                self.save_cache_to_file()
+                    # Save cache to file periodically, and only if it changed
+                    if self._cache_dirty and time.monotonic() - self._last_cache_save > self.cache_save_interval:
+                        self.save_cache_to_file()
                 
-                time.sleep(1)
+                    error_backoff = 1
+                    self._wake.wait(max(0, next_tick - time.monotonic()))
                 
-            except Exception as e:
-                logging.error(f"Error in main loop: {e}")
-                time.sleep(1)
+                except Exception:
+                    log.exception("Error in main loop. Retrying in %s seconds...", error_backoff)
+                    self._stop.wait(error_backoff)
+                    error_backoff = min(error_backoff * 2, 30)
+        finally:
+            # Runs on Ctrl-C (KeyboardInterrupt) as well as a normal stop
+            if not self._stop.is_set():
+                self.stop()
+            # Persist the latest analyses and stop background work
+            if self._cache_dirty:
+                self.save_cache_to_file()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._new_token_executor.shutdown(wait=False, cancel_futures=True)
+            self._order_executor.shutdown(wait=True)
+            log.info("PumpFun Trading Bot stopped.")
 
 
 def main():
-    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
     try:
         bot = PumpFunBot(paper_mode=True)
+        # Shut down cleanly when the process is asked to terminate
+        signal.signal(signal.SIGTERM, bot.stop)
         bot.run()
     except Exception as e:
-        logging.error(f"Error in trading bot: {e}")
+        log.error("Error in trading bot: %s", e)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file